@@ -2,41 +2,119 @@
 
 from __future__ import annotations
 
+import http.client
+import json
+import socket
+import threading
+import time
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, Callable, Protocol
+from urllib.parse import urlsplit
 
 import requests
 
 from .commands import CommandExecutor
 from .config import AssistantConfig
+from .deadline import AdaptiveTimeout, Deadline, DeadlineExceeded, RequestCancelled
 from .memory import MemoryStore
 
 
 class LLMProcessor(Protocol):
     """Contract for LLM-backed response generation."""
 
-    def generate(self, prompt: str) -> str:
-        """Return assistant response text for a user prompt."""
+    def generate(self, prompt: str, **options: Any) -> str:
+        """Return assistant response text for a user prompt.
+
+        Options used by the brain are `deadline` (a `Deadline`) and `max_tokens`.
+        """
 
 
 class LocalLLM:
-    def __init__(self, model: str = "llama3"):
+    def __init__(
+        self,
+        model: str = "llama3",
+        url: str = "http://localhost:11434/api/generate",
+        timeouts: AdaptiveTimeout | None = None,
+        budget_floor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.model = model
-
-    def generate(self, prompt: str) -> str:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-            },
-            timeout=30,
-        )
-
-        data = response.json()
+        self.url = url
+        self.timeouts = timeouts or AdaptiveTimeout()
+        # With a deadline, never time out before this fraction of the remaining budget.
+        self.budget_floor = budget_floor
+        self._clock = clock
+
+    def generate(self, prompt: str, deadline: Deadline | None = None, max_tokens: int | None = None) -> str:
+        payload: dict[str, Any] = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+        }
+        if max_tokens is not None:
+            payload["options"] = {"num_predict": max_tokens}
+
+        started = self._clock()
+        try:
+            if deadline is None:
+                data = requests.post(self.url, json=payload, timeout=self.timeouts.current()).json()
+            else:
+                deadline.check()
+                remaining = deadline.remaining()
+                timeout = min(remaining, self.timeouts.current(floor=remaining * self.budget_floor))
+                data = self._post_cancellable(payload, timeout, deadline)
+        except DeadlineExceeded:
+            self.timeouts.record_timeout(self._clock() - started)
+            raise
+        except TimeoutError as exc:
+            self.timeouts.record_timeout(self._clock() - started)
+            raise DeadlineExceeded("LLM request timed out") from exc
+        self.timeouts.record(self._clock() - started)
         return data["response"]
 
+    def _post_cancellable(self, payload: dict[str, Any], timeout: float, deadline: Deadline) -> dict:
+        """POST that is aborted when `timeout` elapses or `deadline` is cancelled."""
+        parts = urlsplit(self.url)
+        # The abort timer enforces `timeout`; the socket timeout is only a looser backstop.
+        conn = http.client.HTTPConnection(parts.hostname or "localhost", parts.port, timeout=timeout + 1.0)
+        aborted = threading.Event()
+
+        def abort() -> None:
+            aborted.set()
+            sock = conn.sock
+            if sock is not None:
+                try:
+                    # Unblocks a recv() in progress on the requesting thread.
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+        timer = threading.Timer(timeout, abort)
+        timer.daemon = True
+        unregister = deadline.on_cancel(abort)
+        timer.start()
+        try:
+            conn.request(
+                "POST",
+                parts.path or "/",
+                body=json.dumps(payload).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+            )
+            # An abort that fired before the socket existed had nothing to shut down.
+            if aborted.is_set():
+                deadline.check()
+                raise DeadlineExceeded("LLM request timed out")
+            return json.loads(conn.getresponse().read().decode("utf-8"))
+        except (OSError, http.client.HTTPException, ValueError) as exc:
+            if aborted.is_set() or deadline.cancelled or isinstance(exc, TimeoutError):
+                deadline.check()
+                raise DeadlineExceeded("LLM request timed out") from exc
+            raise
+        finally:
+            timer.cancel()
+            unregister()
+            conn.close()
+
 
 @dataclass
 class JarvisBrain:
@@ -47,8 +125,21 @@ class JarvisBrain:
     commands: CommandExecutor
     llm: LLMProcessor
 
-    def handle(self, user_text: str) -> str:
-        """Process one user request and return assistant output."""
+    def routes_to_llm(self, user_text: str) -> bool:
+        """Return True when `handle` would send this text to the LLM."""
+        lowered = user_text.strip().lower()
+        return not (
+            lowered.startswith(self.config.command_prefix)
+            or lowered.startswith(self.config.remember_prefix)
+            or lowered == self.config.list_memory_command
+        )
+
+    def handle(self, user_text: str, deadline: Deadline | None = None) -> str:
+        """Process one user request and return assistant output.
+
+        LLM calls are bounded by `deadline`, or by a new one built from
+        `config.turn_budget` when none is given.
+        """
         stripped = user_text.strip()
         lowered = stripped.lower()
 
@@ -64,7 +155,38 @@ class JarvisBrain:
             notes = self.memory.list_notes()
             response = "No saved memory yet." if not notes else "Memory: " + "; ".join(notes)
         else:
-            response = self.llm.generate(stripped)
+            response = self._generate(stripped, deadline)
 
         self.memory.add_interaction(user_text=stripped, assistant_text=response)
         return response
+
+    def _generate(self, prompt: str, deadline: Deadline | None) -> str:
+        if deadline is None:
+            if self.config.turn_budget is None:
+                return self._generate_unbudgeted(prompt)
+            deadline = Deadline(self.config.turn_budget)
+
+        # Hold back part of the budget so a shorter retry can still finish.
+        reserve = self.config.retry_reserve
+        first = deadline.shortened(reserve) if deadline.remaining() > reserve else deadline
+        try:
+            return self.llm.generate(prompt, deadline=first)
+        except (RequestCancelled, TimeoutError):
+            if deadline.cancelled or first is deadline or deadline.expired:
+                return self.config.fallback_reply
+
+        try:
+            return self.llm.generate(prompt, deadline=deadline, max_tokens=self.config.retry_max_tokens)
+        except (RequestCancelled, TimeoutError):
+            return self.config.fallback_reply
+
+    def _generate_unbudgeted(self, prompt: str) -> str:
+        # Without a turn budget the processor's own timeout still applies.
+        try:
+            return self.llm.generate(prompt)
+        except (RequestCancelled, TimeoutError):
+            pass
+        try:
+            return self.llm.generate(prompt, max_tokens=self.config.retry_max_tokens)
+        except (RequestCancelled, TimeoutError):
+            return self.config.fallback_reply
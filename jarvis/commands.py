@@ -11,6 +11,10 @@ from typing import Callable
 class CommandExecutor:
     """Detect and execute supported user commands."""
 
+    TIME_PHRASES = frozenset({"what time is it", "time", "current time"})
+    BROWSER_PHRASES = frozenset({"open browser", "open the browser"})
+    NOTEPAD_PHRASES = frozenset({"open notepad", "open notes"})
+
     def __init__(self, runner: Callable[[list[str]], None] | None = None) -> None:
         self.runner = runner or self._default_runner
 
@@ -21,19 +25,24 @@ class CommandExecutor:
         """
         text = command_text.strip().lower()
 
-        if text in {"what time is it", "time", "current time"}:
+        if text in self.TIME_PHRASES:
             return f"It is {datetime.now().strftime('%H:%M:%S')}."
 
-        if text in {"open browser", "open the browser"}:
+        if text in self.BROWSER_PHRASES:
             self._open_browser()
             return "Opening browser."
 
-        if text in {"open notepad", "open notes"}:
+        if text in self.NOTEPAD_PHRASES:
             self._open_notepad()
             return "Opening notepad."
 
         return None
 
+    def matches(self, command_text: str) -> bool:
+        """Return True when `execute` would handle this text, without running it."""
+        text = command_text.strip().lower()
+        return text in self.TIME_PHRASES or text in self.BROWSER_PHRASES or text in self.NOTEPAD_PHRASES
+
     @staticmethod
     def _default_runner(command: list[str]) -> None:
         subprocess.Popen(command)
@@ -16,6 +16,26 @@ class AssistantConfig:
     command_prefix: str = "run "
     remember_prefix: str = "remember "
     list_memory_command: str = "show memory"
+    llm_max_concurrent: int = 1
+    turn_budget: float | None = 20.0
+    retry_reserve: float = 5.0
+    retry_max_tokens: int = 64
+    fallback_reply: str = "Sorry, that is taking too long. Please try again."
+    speculative_generation: bool = True
+    speculation_stable_partials: int = 2
+    speculation_budget: int = 1
+    speculation_timeout: float = 20.0
+    suppression_enabled: bool = True
+    echo_window: float = 2.0
+    duplicate_window: float = 3.0
+    echo_threshold: float = 0.6
+    duplicate_threshold: float = 0.8
+    playback_tail: float = 0.3
+    profile_enabled: bool = False
+    profile_sample_rate: float = 0.0
+    profile_slow_threshold: float | None = None
+    profile_dir: Path = Path("profiles")
+    profile_max_files: int = 20
     system_prompt: str = (
         "You are a concise and helpful personal AI assistant. "
         "Keep responses practical."
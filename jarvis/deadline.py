@@ -0,0 +1,127 @@
+"""Per-turn deadlines, cancellation and adaptive request timeouts."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+
+class RequestCancelled(RuntimeError):
+    """Raised when an in-flight request is aborted before it completes."""
+
+
+class DeadlineExceeded(RequestCancelled):
+    """Raised when a request runs past its deadline."""
+
+
+class Deadline:
+    """A latency budget that can also be cancelled from another thread."""
+
+    def __init__(self, budget: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.expires_at = clock() + budget
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+        self._cancelled = False
+
+    def remaining(self) -> float:
+        """Return seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Cancel the deadline and abort anything registered with `on_cancel`."""
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register `callback` to run on cancel; returns a function that unregisters it."""
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+
+                def unregister() -> None:
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+
+                return unregister
+        callback()
+        return lambda: None
+
+    def check(self) -> None:
+        """Raise if the deadline was cancelled or has expired."""
+        if self._cancelled:
+            raise RequestCancelled("request cancelled")
+        if self.expired:
+            raise DeadlineExceeded("deadline exceeded")
+
+    def shortened(self, by: float) -> "Deadline":
+        """Return a child deadline ending `by` seconds earlier, cancelled with this one."""
+        child = Deadline(max(0.0, self.remaining() - by), clock=self._clock)
+        self.on_cancel(child.cancel)
+        return child
+
+
+class AdaptiveTimeout:
+    """Derive request timeouts from a percentile of recent response times.
+
+    Requests that hit the timeout are recorded as `backoff` times the time
+    they ran, so the timeout grows back after slow responses instead of
+    staying pinned to the earlier fast ones.
+    """
+
+    def __init__(
+        self,
+        initial: float = 30.0,
+        minimum: float = 2.0,
+        maximum: float = 30.0,
+        percentile: float = 99.0,
+        multiplier: float = 2.0,
+        backoff: float = 2.0,
+        window: int = 50,
+        min_samples: int = 5,
+    ) -> None:
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.backoff = backoff
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float) -> None:
+        """Record one successful response time in seconds."""
+        with self._lock:
+            self._samples.append(elapsed)
+
+    def record_timeout(self, elapsed: float) -> None:
+        """Record a request aborted after `elapsed` seconds without a response."""
+        with self._lock:
+            self._samples.append(elapsed * self.backoff)
+
+    def current(self, floor: float = 0.0) -> float:
+        """Return the timeout to use for the next request, never below `floor`."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return max(floor, self.initial)
+        index = min(len(samples) - 1, max(0, round(self.percentile / 100 * len(samples)) - 1))
+        adaptive = min(self.maximum, max(self.minimum, samples[index] * self.multiplier))
+        return max(floor, adaptive)
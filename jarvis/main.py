@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
-from .brain import JarvisBrain, LocalLLM
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from .brain import JarvisBrain, LLMProcessor, LocalLLM
 from .commands import CommandExecutor
 from .config import AssistantConfig
+from .deadline import Deadline
 from .memory import MemoryStore
+from .profiling import TurnProfiler
+from .scheduler import LLMScheduler
+from .speculation import SpeculativeLLM
+from .suppression import EchoAwareVoiceOutput, UtteranceSuppressor
 from .voice_input import ConsoleVoiceInput, SpeechRecognitionVoiceInput, VoiceInput
 from .voice_output import Pyttsx3VoiceOutput, VoiceOutput
 
@@ -17,16 +28,26 @@ class ConsoleVoiceOutput:
         print(f"Assistant: {text}")
 
 
-def build_assistant() -> tuple[JarvisBrain, MemoryStore, CommandExecutor, VoiceInput, VoiceOutput]:
+def build_assistant() -> tuple[
+    AssistantConfig, JarvisBrain, MemoryStore, CommandExecutor, VoiceInput, VoiceOutput
+]:
     """Initialize memory and wire all modules."""
     config = AssistantConfig()
     memory = MemoryStore(path=config.memory_file)
     commands = CommandExecutor()
+    llm: LLMProcessor = LLMScheduler(LocalLLM(), max_concurrent=config.llm_max_concurrent)
+    if config.speculative_generation:
+        llm = SpeculativeLLM(
+            llm,
+            stable_partials=config.speculation_stable_partials,
+            max_speculations=config.speculation_budget,
+            timeout=config.speculation_timeout,
+        )
     brain = JarvisBrain(
         config=config,
         memory=memory,
         commands=commands,
-        llm=LocalLLM(),
+        llm=llm,
     )
 
     speech_listener = SpeechRecognitionVoiceInput()
@@ -37,16 +58,64 @@ def build_assistant() -> tuple[JarvisBrain, MemoryStore, CommandExecutor, VoiceI
     except RuntimeError:
         speaker = ConsoleVoiceOutput()
 
-    return brain, memory, commands, listener, speaker
+    return config, brain, memory, commands, listener, speaker
+
+
+def _listen(
+    listener: VoiceInput,
+    brain: JarvisBrain,
+    commands: CommandExecutor,
+    suppressor: UtteranceSuppressor,
+    dedupe: bool,
+) -> str:
+    """Capture one utterance, speculating on partials when the listener streams them.
+
+    Partials the suppressor would drop are not speculated on, so echoes and
+    duplicates never cost a model call.
+    """
+    speculator = getattr(brain, "llm", None)
+    listen_stream = getattr(listener, "listen_stream", None)
+    if not isinstance(speculator, SpeculativeLLM) or listen_stream is None:
+        return listener.listen()
+
+    speculator.begin_turn(
+        should_speculate=lambda text: (
+            text.lower() != "shutdown"
+            and brain.routes_to_llm(text)
+            and not commands.matches(text)
+            and suppressor.peek(text, dedupe=dedupe) is None
+        ),
+    )
+    return listen_stream(speculator.on_partial)
+
+
+@contextmanager
+def _cancel_on_interrupt(deadline: Deadline | None) -> Iterator[None]:
+    """Let Ctrl+C abort the in-flight turn instead of exiting the assistant."""
+    if deadline is None or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = signal.signal(signal.SIGINT, lambda signum, frame: deadline.cancel())
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous)
 
 
 def run() -> None:
     """Run continuously until user says 'shutdown'."""
-    brain, memory, commands, listener, speaker = build_assistant()
+    config, brain, memory, commands, listener, speaker = build_assistant()
+    profiler = TurnProfiler.from_config(config)
+    suppressor = UtteranceSuppressor.from_config(config)
+    # Console output cannot leak into the microphone, so only real TTS mutes capture.
+    speaker = EchoAwareVoiceOutput(speaker, suppressor, audible=isinstance(speaker, Pyttsx3VoiceOutput))
+    # Only the microphone re-captures an utterance; a typed repeat is deliberate.
+    dedupe = isinstance(listener, SpeechRecognitionVoiceInput)
     speaker.speak("Jarvis is online. Say 'shutdown' to stop.")
 
     while True:
-        user_text = listener.listen().strip()
+        suppressor.wait_until_unmuted()
+        user_text = _listen(listener, brain, commands, suppressor, dedupe).strip()
         if not user_text:
             continue
 
@@ -54,12 +123,23 @@ def run() -> None:
             speaker.speak("Shutting down.")
             break
 
-        command_response = commands.execute(user_text)
-        if command_response is not None:
-            response = command_response
-            memory.add_interaction(user_text=user_text, assistant_text=response)
-        else:
-            response = brain.handle(user_text)
+        if suppressor.check(user_text, dedupe=dedupe) is not None:
+            continue
+
+        with profiler.turn():
+            command_response = commands.execute(user_text)
+            if command_response is not None:
+                response = command_response
+                memory.add_interaction(user_text=user_text, assistant_text=response)
+            else:
+                started = time.perf_counter()
+                deadline = Deadline(config.turn_budget) if config.turn_budget is not None else None
+                with _cancel_on_interrupt(deadline):
+                    response = brain.handle(user_text, deadline=deadline)
+                suppressor.record_turn_cost(time.perf_counter() - started)
+
+        if isinstance(getattr(brain, "llm", None), SpeculativeLLM):
+            brain.llm.end_turn()
 
         speaker.speak(response)
 
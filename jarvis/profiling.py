@@ -0,0 +1,192 @@
+"""On-demand per-turn CPU profiling and allocation tracing."""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator
+
+from .config import AssistantConfig
+
+PROFILE_ENV_VAR = "JARVIS_PROFILE"
+
+_Func = tuple[str, int, str]
+
+
+def _frame_name(func: _Func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def collapsed_stacks(
+    stats: pstats.Stats,
+    max_depth: int = 64,
+    min_fraction: float = 0.001,
+    max_nodes: int = 20_000,
+) -> list[str]:
+    """Convert profile stats to collapsed-stack lines (`a;b;c <microseconds>`).
+
+    cProfile only records caller/callee edges, so deeper paths are
+    approximated by splitting each function's time across its callers. Paths
+    carrying less than `min_fraction` of the total are folded into their
+    parent frame, and at most `max_nodes` frames are expanded, which keeps the
+    walk bounded on large, densely connected call graphs.
+    """
+    raw: dict[_Func, Any] = stats.stats  # type: ignore[attr-defined]
+    children: dict[_Func, dict[_Func, float]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, {})[func] = edge[3]
+
+    roots = [(func, entry[3]) for func, entry in raw.items() if not entry[4]]
+    cutoff = sum(cumulative for _, cumulative in roots) * min_fraction
+    totals: dict[str, float] = {}
+    budget = max_nodes
+    # Iterative depth-first walk: (function, parent stack, ancestors, time share).
+    pending: list[tuple[_Func, tuple[str, ...], frozenset[_Func], float]] = [
+        (func, (), frozenset({func}), cumulative) for func, cumulative in roots
+    ]
+    while pending:
+        func, path, seen, share = pending.pop()
+        _, _, self_time, cumulative, _ = raw[func]
+        stack = path + (_frame_name(func),)
+        key = ";".join(stack)
+        scale = share / cumulative if cumulative else 0.0
+        kept = self_time * scale
+        budget -= 1
+        for child, edge_time in children.get(func, {}).items():
+            child_share = edge_time * scale
+            expand = (
+                child in raw
+                and child not in seen
+                and child_share >= cutoff
+                and len(stack) < max_depth
+                and budget - len(pending) > 0
+            )
+            if expand:
+                pending.append((child, stack, seen | {child}, child_share))
+            elif child not in seen:
+                kept += child_share
+        totals[key] = totals.get(key, 0.0) + kept
+
+    lines = []
+    for stack, seconds in totals.items():
+        micros = int(round(seconds * 1_000_000))
+        if micros > 0:
+            lines.append(f"{stack} {micros}")
+    return lines
+
+
+class TurnProfiler:
+    """Capture cProfile and tracemalloc data for sampled or slow turns.
+
+    Profiling runs for a turn when it is sampled, or for every turn when a slow
+    threshold is set (output is only kept if the turn exceeds it). When
+    disabled, `turn` returns a no-op context manager.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        enabled: bool = False,
+        sample_rate: float = 0.0,
+        slow_threshold: float | None = None,
+        max_files: int = 20,
+        top_allocations: int = 25,
+        rng: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.max_files = max_files
+        self.top_allocations = top_allocations
+        self._rng = rng
+        self._clock = clock
+        self._counter = 0
+
+    @classmethod
+    def from_config(cls, config: AssistantConfig, environ: dict[str, str] | None = None) -> "TurnProfiler":
+        """Build from AssistantConfig; a truthy JARVIS_PROFILE env var forces it on."""
+        env = os.environ if environ is None else environ
+        forced = env.get(PROFILE_ENV_VAR, "").strip().lower() in {"1", "true", "yes", "on"}
+        sample_rate = config.profile_sample_rate
+        if forced and not sample_rate and config.profile_slow_threshold is None:
+            # The env var alone means "profile every turn".
+            sample_rate = 1.0
+        return cls(
+            output_dir=config.profile_dir,
+            enabled=config.profile_enabled or forced,
+            sample_rate=sample_rate,
+            slow_threshold=config.profile_slow_threshold,
+            max_files=config.profile_max_files,
+        )
+
+    def turn(self, label: str = "turn") -> ContextManager[None]:
+        """Return a context manager that profiles one turn when selected."""
+        if not self.enabled:
+            return nullcontext()
+        sampled = self.sample_rate > 0 and self._rng() < self.sample_rate
+        if not sampled and self.slow_threshold is None:
+            return nullcontext()
+        return self._profile(label, sampled)
+
+    @contextmanager
+    def _profile(self, label: str, sampled: bool) -> Iterator[None]:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        started = self._clock()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = self._clock() - started
+            slow = self.slow_threshold is not None and elapsed >= self.slow_threshold
+            snapshot = tracemalloc.take_snapshot() if sampled or slow else None
+            if started_tracing:
+                tracemalloc.stop()
+            if snapshot is not None:
+                self._write(label, elapsed, profiler, snapshot)
+
+    def _write(
+        self,
+        label: str,
+        elapsed: float,
+        profiler: cProfile.Profile,
+        snapshot: tracemalloc.Snapshot,
+    ) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._counter += 1
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._counter:04d}-{label}"
+        base = self.output_dir / stem
+
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(str(base.with_suffix(".prof")))
+        base.with_suffix(".collapsed").write_text(
+            "\n".join(collapsed_stacks(stats)) + "\n", encoding="utf-8"
+        )
+
+        top = snapshot.statistics("lineno")[: self.top_allocations]
+        lines = [f"# {label} took {elapsed * 1000:.1f} ms"]
+        lines.extend(str(stat) for stat in top)
+        base.with_suffix(".alloc.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        self._rotate()
+
+    def _rotate(self) -> None:
+        stems = sorted({path.name.split(".", 1)[0] for path in self.output_dir.iterdir() if path.is_file()})
+        for stem in stems[: max(0, len(stems) - self.max_files)]:
+            for path in self.output_dir.glob(f"{stem}.*"):
+                path.unlink()
@@ -0,0 +1,207 @@
+"""Priority scheduling for LLM calls sharing one backend."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable
+
+from .brain import LLMProcessor
+from .deadline import Deadline
+
+
+class Priority(IntEnum):
+    """Priority classes; lower values are dispatched first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass
+class _Job:
+    prompt: str
+    priority: Priority
+    session: str
+    options: dict[str, Any]
+    enqueued_at: float
+    granted: bool = False
+
+
+@dataclass
+class _PriorityQueue:
+    """Per-session FIFO queues served round-robin for fairness."""
+
+    sessions: OrderedDict[str, deque[_Job]] = field(default_factory=OrderedDict)
+
+    def __len__(self) -> int:
+        return sum(len(jobs) for jobs in self.sessions.values())
+
+    def push(self, job: _Job) -> None:
+        self.sessions.setdefault(job.session, deque()).append(job)
+
+    def pop(self) -> _Job:
+        session, jobs = next(iter(self.sessions.items()))
+        job = jobs.popleft()
+        # Rotate the served session to the back so other sessions go next.
+        del self.sessions[session]
+        if jobs:
+            self.sessions[session] = jobs
+        return job
+
+    def remove(self, job: _Job) -> None:
+        jobs = self.sessions.get(job.session)
+        if jobs is None or job not in jobs:
+            return
+        jobs.remove(job)
+        if not jobs:
+            del self.sessions[job.session]
+
+
+class LLMScheduler:
+    """Queue LLM calls in front of one backend with priorities and a concurrency limit.
+
+    Callers block in `submit` until a backend slot is granted and then run the
+    request on their own thread. Queued interactive jobs are always granted
+    before background jobs, and jobs within a class are served round-robin by
+    session. A `deadline` option bounds the time spent waiting in the queue.
+    """
+
+    def __init__(
+        self,
+        llm: LLMProcessor,
+        max_concurrent: int = 1,
+        wait_samples: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.llm = llm
+        self.max_concurrent = max_concurrent
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queues = {priority: _PriorityQueue() for priority in Priority}
+        self._active = 0
+        self._running: Counter[str] = Counter()
+        # Priorities promised to sessions whose job has not been enqueued yet.
+        self._session_priority: dict[str, Priority] = {}
+        self._waits = {priority: deque(maxlen=wait_samples) for priority in Priority}
+
+    def generate(self, prompt: str, **options: Any) -> str:
+        """LLMProcessor interface; direct calls are treated as interactive turns."""
+        return self.submit(prompt, priority=Priority.INTERACTIVE, **options)
+
+    def submit(
+        self,
+        prompt: str,
+        priority: Priority = Priority.BACKGROUND,
+        session: str = "default",
+        **options: Any,
+    ) -> str:
+        """Wait for a backend slot, then return the LLM response for `prompt`."""
+        deadline: Deadline | None = options.get("deadline")
+        unregister = deadline.on_cancel(self._wake) if deadline is not None else None
+        with self._cond:
+            priority = self._session_priority.pop(session, priority)
+            job = _Job(prompt, priority, session, options, enqueued_at=self._clock())
+            self._queues[priority].push(job)
+            self._dispatch()
+            try:
+                while not job.granted:
+                    if deadline is not None:
+                        deadline.check()
+                    self._cond.wait(deadline.remaining() if deadline is not None else None)
+            except BaseException:
+                if job.granted:
+                    self._release()
+                else:
+                    self._queues[job.priority].remove(job)
+                raise
+            finally:
+                if unregister is not None:
+                    unregister()
+            self._waits[job.priority].append(self._clock() - job.enqueued_at)
+            self._running[session] += 1
+
+        try:
+            return self.llm.generate(job.prompt, **job.options)
+        finally:
+            with self._cond:
+                self._running[session] -= 1
+                if not self._running[session]:
+                    del self._running[session]
+                self._release()
+
+    def reprioritize(self, session: str, priority: Priority) -> None:
+        """Move a session's queued jobs to `priority`.
+
+        If the session has nothing queued or running yet, its next submitted
+        job is enqueued at `priority` instead.
+        """
+        with self._cond:
+            moved = False
+            for queue in self._queues.values():
+                jobs = queue.sessions.pop(session, None)
+                if not jobs:
+                    continue
+                for job in jobs:
+                    job.priority = priority
+                    self._queues[priority].push(job)
+                moved = True
+            if not moved and not self._running[session]:
+                self._session_priority[session] = priority
+            self._dispatch()
+
+    def queue_depth(self, priority: Priority | None = None) -> int:
+        """Return the number of queued (not yet running) jobs."""
+        with self._cond:
+            if priority is not None:
+                return len(self._queues[priority])
+            return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def active(self) -> int:
+        """Return the number of requests currently running on the backend."""
+        with self._cond:
+            return self._active
+
+    def wait_percentile(self, priority: Priority, percentile: float) -> float:
+        """Return a queue wait-time percentile in seconds over recent jobs."""
+        with self._cond:
+            samples = sorted(self._waits[priority])
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, max(0, round(percentile / 100 * len(samples)) - 1))
+        return samples[index]
+
+    def metrics(self) -> dict[str, float]:
+        """Return queue depth and wait-time metrics per priority class."""
+        result: dict[str, float] = {"active": float(self.active)}
+        for priority in Priority:
+            name = priority.name.lower()
+            result[f"{name}_queue_depth"] = float(self.queue_depth(priority))
+            result[f"{name}_wait_p50"] = self.wait_percentile(priority, 50)
+            result[f"{name}_wait_p99"] = self.wait_percentile(priority, 99)
+        return result
+
+    def _wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        granted = False
+        while self._active < self.max_concurrent:
+            queue = next((q for q in self._queues.values() if len(q)), None)
+            if queue is None:
+                break
+            queue.pop().granted = True
+            self._active += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
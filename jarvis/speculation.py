@@ -0,0 +1,181 @@
+"""Speculative LLM generation from partial speech transcripts."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .brain import LLMProcessor
+from .deadline import Deadline, RequestCancelled
+from .scheduler import LLMScheduler, Priority
+from .voice_input import normalize_transcript
+
+
+@dataclass
+class _Speculation:
+    prompt: str
+    key: str
+    started_at: float
+    deadline: Deadline
+    session: str
+    finished_at: float | None = None
+    result: str | None = None
+    error: BaseException | None = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+@dataclass
+class SpeculationStats:
+    """Counters for speculative generation outcomes."""
+
+    started: int = 0
+    hits: int = 0
+    wasted: int = 0
+    latency_saved: float = 0.0
+
+
+class SpeculativeLLM:
+    """LLMProcessor wrapper that starts generation on a stable partial transcript.
+
+    The main loop calls `begin_turn`, feeds partial hypotheses to `on_partial`
+    and then routes the final transcript as usual. When the brain asks for a
+    prompt that matches the speculated one, the in-flight or finished result is
+    reused; otherwise the speculation is cancelled, counted as wasted and a
+    fresh generation runs. Speculations run at background priority when the
+    wrapped processor is an `LLMScheduler`, so live turns never queue behind them;
+    a speculation adopted by the live turn is promoted to interactive priority.
+    """
+
+    def __init__(
+        self,
+        llm: LLMProcessor,
+        stable_partials: int = 2,
+        max_speculations: int = 1,
+        timeout: float = 20.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.llm = llm
+        self.stable_partials = stable_partials
+        self.max_speculations = max_speculations
+        self.timeout = timeout
+        self.stats = SpeculationStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._should_speculate: Callable[[str], bool] = lambda _: True
+        self._pending: _Speculation | None = None
+        self._last_partial = ""
+        self._repeats = 0
+        self._budget = 0
+        self._ids = itertools.count()
+
+    def begin_turn(self, should_speculate: Callable[[str], bool] | None = None) -> None:
+        """Reset per-turn state; `should_speculate` filters non-LLM routes."""
+        self.end_turn()
+        with self._lock:
+            self._should_speculate = should_speculate or (lambda _: True)
+            self._last_partial = ""
+            self._repeats = 0
+            self._budget = self.max_speculations
+
+    def end_turn(self) -> None:
+        """Cancel any speculation that the final transcript did not use."""
+        with self._lock:
+            speculation, self._pending = self._pending, None
+        if speculation is not None:
+            self._discard(speculation)
+
+    def on_partial(self, text: str) -> None:
+        """Record a partial hypothesis and speculate once it is stable."""
+        prompt = text.strip()
+        key = normalize_transcript(prompt)
+        if not key:
+            return
+
+        with self._lock:
+            if key == self._last_partial:
+                self._repeats += 1
+            else:
+                self._last_partial = key
+                self._repeats = 1
+
+            if self._repeats < self.stable_partials or self._budget <= 0:
+                return
+            if self._pending is not None and self._pending.key == key:
+                return
+            if not self._should_speculate(prompt):
+                return
+
+            replaced = self._pending
+            self._budget -= 1
+            self.stats.started += 1
+            speculation = _Speculation(
+                prompt=prompt,
+                key=key,
+                started_at=self._clock(),
+                deadline=Deadline(self.timeout),
+                session=f"speculation-{next(self._ids)}",
+            )
+            self._pending = speculation
+
+        if replaced is not None:
+            self._discard(replaced)
+        threading.Thread(target=self._run, args=(speculation,), daemon=True).start()
+
+    def generate(self, prompt: str, deadline: Deadline | None = None, **options: Any) -> str:
+        """Return the speculated result when it matches `prompt`, else generate."""
+        with self._lock:
+            speculation, self._pending = self._pending, None
+
+        if speculation is not None:
+            if not options and speculation.key == normalize_transcript(prompt):
+                return self._collect(speculation, deadline)
+            self._discard(speculation)
+
+        if deadline is not None:
+            options["deadline"] = deadline
+        return self.llm.generate(prompt, **options)
+
+    def _collect(self, speculation: _Speculation, deadline: Deadline | None) -> str:
+        requested_at = self._clock()
+        if not speculation.done.is_set() and isinstance(self.llm, LLMScheduler):
+            # The live turn now depends on this job; don't leave it behind background work.
+            self.llm.reprioritize(speculation.session, Priority.INTERACTIVE)
+        while not speculation.done.wait(0.05 if deadline is not None else None):
+            try:
+                deadline.check()  # type: ignore[union-attr]
+            except RequestCancelled:
+                self._discard(speculation)
+                raise
+        finished_at = speculation.finished_at if speculation.finished_at is not None else requested_at
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.latency_saved += max(0.0, min(requested_at, finished_at) - speculation.started_at)
+        if speculation.error is not None:
+            raise speculation.error
+        return speculation.result or ""
+
+    def _discard(self, speculation: _Speculation) -> None:
+        with self._lock:
+            self.stats.wasted += 1
+        # Aborts the request (or its queue wait) so it frees the backend slot.
+        speculation.deadline.cancel()
+
+    def _run(self, speculation: _Speculation) -> None:
+        try:
+            if isinstance(self.llm, LLMScheduler):
+                speculation.result = self.llm.submit(
+                    speculation.prompt,
+                    priority=Priority.BACKGROUND,
+                    session=speculation.session,
+                    deadline=speculation.deadline,
+                )
+            else:
+                speculation.result = self.llm.generate(speculation.prompt, deadline=speculation.deadline)
+        except Exception as exc:  # surfaced to the turn that collects it
+            speculation.error = exc
+        finally:
+            speculation.finished_at = self._clock()
+            speculation.done.set()
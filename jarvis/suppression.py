@@ -0,0 +1,244 @@
+"""Self-echo and duplicate-utterance suppression ahead of the brain."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Callable
+
+from .config import AssistantConfig
+from .voice_input import normalize_transcript
+from .voice_output import VoiceOutput
+
+
+def shingles(text: str, size: int = 2) -> set[str]:
+    """Return word n-gram shingles; short texts become one whole-text shingle."""
+    words = normalize_transcript(text).split()
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+class _ShingleIndex:
+    """Time-windowed postings from shingle to the recent texts containing it.
+
+    Expiry is amortized O(1) per entry, and a lookup only touches the postings
+    of the query's own shingles, so checks never scan the whole history.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._entries: deque[tuple[int, float, set[str]]] = deque()
+        self._postings: dict[str, set[int]] = {}
+        self._sizes: dict[int, int] = {}
+        self._next_id = 0
+
+    def add(self, items: set[str], now: float) -> None:
+        self._expire(now)
+        if not items:
+            return
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries.append((entry_id, now, items))
+        self._sizes[entry_id] = len(items)
+        for item in items:
+            self._postings.setdefault(item, set()).add(entry_id)
+
+    def similarity(self, items: set[str], now: float) -> float:
+        """Return the best two-way containment between `items` and one recent text.
+
+        Both directions must match, so a short reply is not mistaken for an
+        echo just because its words appear in a longer sentence.
+        """
+        self._expire(now)
+        if not items:
+            return 0.0
+        shared: Counter[int] = Counter()
+        for item in items:
+            shared.update(self._postings.get(item, ()))
+        return max(
+            (min(count / len(items), count / self._sizes[entry_id]) for entry_id, count in shared.items()),
+            default=0.0,
+        )
+
+    def _expire(self, now: float) -> None:
+        while self._entries and now - self._entries[0][1] > self.window:
+            entry_id, _, items = self._entries.popleft()
+            del self._sizes[entry_id]
+            for item in items:
+                postings = self._postings[item]
+                postings.discard(entry_id)
+                if not postings:
+                    del self._postings[item]
+
+
+@dataclass
+class SuppressionStats:
+    """Counters for utterances dropped before reaching the brain."""
+
+    echoes: int = 0
+    duplicates: int = 0
+    muted: int = 0
+    model_time_avoided: float = 0.0
+
+    @property
+    def suppressed(self) -> int:
+        return self.echoes + self.duplicates + self.muted
+
+
+class UtteranceSuppressor:
+    """Drop assistant self-echoes, repeated utterances and audio captured during playback.
+
+    Assistant speech is indexed when playback ends and only matched for
+    `echo_window` seconds afterwards; utterances shorter than
+    `min_echo_words` are never treated as echoes. Each check costs time
+    proportional to the utterance length, not to the amount of recent history.
+    """
+
+    def __init__(
+        self,
+        echo_window: float = 2.0,
+        duplicate_window: float = 3.0,
+        echo_threshold: float = 0.6,
+        duplicate_threshold: float = 0.8,
+        shingle_size: int = 2,
+        min_echo_words: int = 3,
+        playback_tail: float = 0.3,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.echo_threshold = echo_threshold
+        self.duplicate_threshold = duplicate_threshold
+        self.shingle_size = shingle_size
+        self.min_echo_words = min_echo_words
+        self.playback_tail = playback_tail
+        self.enabled = enabled
+        self.stats = SuppressionStats()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._assistant = _ShingleIndex(echo_window)
+        self._user = _ShingleIndex(duplicate_window)
+        self._playing = 0
+        self._unmute_at = 0.0
+        self._turn_cost = 0.0
+
+    @classmethod
+    def from_config(cls, config: AssistantConfig) -> "UtteranceSuppressor":
+        return cls(
+            echo_window=config.echo_window,
+            duplicate_window=config.duplicate_window,
+            echo_threshold=config.echo_threshold,
+            duplicate_threshold=config.duplicate_threshold,
+            playback_tail=config.playback_tail,
+            enabled=config.suppression_enabled,
+        )
+
+    @property
+    def muted(self) -> bool:
+        """True while audio is playing or within the tail after playback ends."""
+        with self._lock:
+            return self._playing > 0 or self._clock() < self._unmute_at
+
+    def record_assistant(self, text: str) -> None:
+        """Index text the assistant has just played back."""
+        items = shingles(text, self.shingle_size)
+        with self._lock:
+            self._assistant.add(items, self._clock())
+
+    def playback_started(self) -> None:
+        with self._lock:
+            self._playing += 1
+
+    def playback_finished(self) -> None:
+        with self._lock:
+            self._playing = max(0, self._playing - 1)
+            self._unmute_at = self._clock() + self.playback_tail
+
+    def wait_until_unmuted(self) -> None:
+        """Block capture until playback and its tail have finished."""
+        if not self.enabled:
+            return
+        while True:
+            with self._lock:
+                if self._playing > 0:
+                    delay = self.playback_tail or 0.05
+                else:
+                    delay = self._unmute_at - self._clock()
+            if delay <= 0:
+                return
+            self._sleep(delay)
+
+    def record_turn_cost(self, seconds: float) -> None:
+        """Feed the time a brain turn took; used to estimate model time avoided."""
+        with self._lock:
+            self._turn_cost = seconds if not self._turn_cost else 0.8 * self._turn_cost + 0.2 * seconds
+
+    def check(self, user_text: str, dedupe: bool = True) -> str | None:
+        """Return why `user_text` should be dropped, or None to let it through.
+
+        Utterances that pass are indexed for later duplicate checks. Pass
+        `dedupe=False` for typed input, where a repeat is always deliberate.
+        """
+        if not self.enabled:
+            return None
+        items = shingles(user_text, self.shingle_size)
+        with self._lock:
+            now = self._clock()
+            reason = self._reason(user_text, items, now, dedupe)
+            if reason is None:
+                self._user.add(items, now)
+                return None
+            if reason == "muted":
+                self.stats.muted += 1
+            elif reason == "echo":
+                self.stats.echoes += 1
+            else:
+                self.stats.duplicates += 1
+            self.stats.model_time_avoided += self._turn_cost
+            return reason
+
+    def peek(self, user_text: str, dedupe: bool = True) -> str | None:
+        """Like `check`, but without indexing the text or updating stats."""
+        if not self.enabled:
+            return None
+        items = shingles(user_text, self.shingle_size)
+        with self._lock:
+            return self._reason(user_text, items, self._clock(), dedupe)
+
+    def _reason(self, user_text: str, items: set[str], now: float, dedupe: bool) -> str | None:
+        if self._playing > 0 or now < self._unmute_at:
+            return "muted"
+        echo_candidate = len(normalize_transcript(user_text).split()) >= self.min_echo_words
+        if echo_candidate and self._assistant.similarity(items, now) >= self.echo_threshold:
+            return "echo"
+        if dedupe and self._user.similarity(items, now) >= self.duplicate_threshold:
+            return "duplicate"
+        return None
+
+
+class EchoAwareVoiceOutput:
+    """VoiceOutput wrapper that mutes capture during playback and indexes what was played.
+
+    Non-audible outputs (e.g. the console) cannot reach the microphone, so
+    their text is not indexed for echo matching.
+    """
+
+    def __init__(self, speaker: VoiceOutput, suppressor: UtteranceSuppressor, audible: bool = True) -> None:
+        self.speaker = speaker
+        self.suppressor = suppressor
+        self.audible = audible
+
+    def speak(self, text: str) -> None:
+        if not self.audible:
+            self.speaker.speak(text)
+            return
+        self.suppressor.playback_started()
+        try:
+            self.speaker.speak(text)
+        finally:
+            self.suppressor.record_assistant(text)
+            self.suppressor.playback_finished()
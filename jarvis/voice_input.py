@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Any, Protocol
+import re
+from typing import Any, Callable, Protocol
+
+
+def normalize_transcript(text: str) -> str:
+    """Normalize a transcript so hypotheses differing only in case or punctuation compare equal."""
+    words = re.sub(r"[^\w\s']", " ", text.lower()).split()
+    return " ".join(words)
 
 
 class VoiceInput(Protocol):
@@ -12,6 +19,13 @@ class VoiceInput(Protocol):
         """Capture and return user utterance as text."""
 
 
+class StreamingVoiceInput(Protocol):
+    """Contract for recognizers that report partial hypotheses while listening."""
+
+    def listen_stream(self, on_partial: Callable[[str], None]) -> str:
+        """Call `on_partial` with each interim hypothesis and return the final text."""
+
+
 class SpeechRecognitionVoiceInput:
     """Microphone-based speech-to-text input using `speech_recognition`."""
 
@@ -1,29 +1,49 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 import jarvis.brain as brain_module
 import jarvis.commands as commands_module
 import jarvis.config as config_module
+import jarvis.deadline as deadline_module
 import jarvis.memory as memory_module
 
 
 class EchoLLM:
-    def generate(self, prompt: str) -> str:
+    def generate(self, prompt: str, **options) -> str:
         return f"echo:{prompt}"
 
 
+class SlowLLM:
+    """Fails the first full-length attempt, succeeds on the short retry."""
+
+    def __init__(self, fail_all: bool = False) -> None:
+        self.fail_all = fail_all
+        self.calls: list[dict] = []
+
+    def generate(self, prompt: str, deadline=None, max_tokens=None) -> str:
+        self.calls.append({"deadline": deadline, "max_tokens": max_tokens})
+        if self.fail_all or max_tokens is None:
+            raise deadline_module.DeadlineExceeded("too slow")
+        return "short answer"
+
+
 class FakeResponse:
     def json(self) -> dict[str, str]:
         return {"response": "concise answer"}
 
 
-def _build(tmp_path: Path) -> brain_module.JarvisBrain:
-    config = config_module.AssistantConfig(memory_file=tmp_path / "memory.json")
+def _build(tmp_path: Path, llm=None, **config_overrides) -> brain_module.JarvisBrain:
+    config = config_module.AssistantConfig(memory_file=tmp_path / "memory.json", **config_overrides)
     return brain_module.JarvisBrain(
         config=config,
         memory=memory_module.MemoryStore(path=config.memory_file),
         commands=commands_module.CommandExecutor(),
-        llm=EchoLLM(),
+        llm=llm or EchoLLM(),
     )
 
 
@@ -67,3 +87,185 @@ def test_local_llm_calls_ollama(monkeypatch) -> None:
     assert result == "concise answer"
     assert calls[0]["url"] == "http://localhost:11434/api/generate"
     assert calls[0]["json"]["prompt"] == "hello"
+
+
+def test_routes_to_llm_skips_local_routes(tmp_path: Path) -> None:
+    brain = _build(tmp_path)
+
+    assert brain.routes_to_llm("tell me a joke")
+    assert not brain.routes_to_llm("run what time is it")
+    assert not brain.routes_to_llm("remember buy eggs")
+    assert not brain.routes_to_llm("show memory")
+
+
+def test_slow_llm_retries_with_fewer_tokens(tmp_path: Path) -> None:
+    llm = SlowLLM()
+    brain = _build(tmp_path, llm=llm, turn_budget=20.0, retry_reserve=5.0, retry_max_tokens=32)
+
+    response = brain.handle("explain quantum physics")
+
+    assert response == "short answer"
+    assert [call["max_tokens"] for call in llm.calls] == [None, 32]
+    assert llm.calls[0]["deadline"].remaining() < llm.calls[1]["deadline"].remaining()
+
+
+def test_exhausted_budget_returns_fallback(tmp_path: Path) -> None:
+    brain = _build(tmp_path, llm=SlowLLM(fail_all=True))
+
+    assert brain.handle("hello") == brain.config.fallback_reply
+
+
+def test_cancelled_turn_skips_retry(tmp_path: Path) -> None:
+    llm = SlowLLM()
+    brain = _build(tmp_path, llm=llm)
+    deadline = deadline_module.Deadline(20.0)
+    deadline.cancel()
+
+    assert brain.handle("hello", deadline=deadline) == brain.config.fallback_reply
+    assert len(llm.calls) == 1
+
+
+def test_local_llm_abandons_request_on_cancel() -> None:
+    release = threading.Event()
+
+    class StallingHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers["Content-Length"]))
+            release.wait(timeout=5)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StallingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    llm = brain_module.LocalLLM(url=f"http://127.0.0.1:{server.server_port}/api/generate")
+    deadline = deadline_module.Deadline(10.0)
+    threading.Timer(0.1, deadline.cancel).start()
+
+    started = time.monotonic()
+    try:
+        with pytest.raises(deadline_module.RequestCancelled):
+            llm.generate("hello", deadline=deadline)
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+
+    assert time.monotonic() - started < 2
+
+
+def test_local_llm_timeout_recovers_after_slow_responses() -> None:
+    now = [0.0]
+    response_times = [0.01] * 5 + [0.3, 0.3]
+    timeouts = deadline_module.AdaptiveTimeout(minimum=0.1, maximum=5.0, min_samples=5)
+    llm = brain_module.LocalLLM(timeouts=timeouts, budget_floor=0.0, clock=lambda: now[0])
+
+    def fake_post(payload, timeout, deadline) -> dict:
+        elapsed = response_times.pop(0)
+        now[0] += min(elapsed, timeout)
+        if elapsed > timeout:
+            raise deadline_module.DeadlineExceeded("LLM request timed out")
+        return {"response": "ok"}
+
+    llm._post_cancellable = fake_post
+
+    for _ in range(5):
+        assert llm.generate("fast", deadline=deadline_module.Deadline(10.0)) == "ok"
+    assert timeouts.current() == 0.1
+
+    with pytest.raises(deadline_module.DeadlineExceeded):
+        llm.generate("slow", deadline=deadline_module.Deadline(10.0))
+    assert timeouts.current() > 0.3
+
+    assert llm.generate("slow", deadline=deadline_module.Deadline(10.0)) == "ok"
+
+
+def test_local_llm_timeout_floor_tracks_turn_budget() -> None:
+    timeouts = deadline_module.AdaptiveTimeout(minimum=0.1, min_samples=1)
+    timeouts.record(0.01)
+    llm = brain_module.LocalLLM(timeouts=timeouts, budget_floor=0.5)
+    seen: list[float] = []
+    llm._post_cancellable = lambda payload, timeout, deadline: seen.append(timeout) or {"response": "ok"}
+
+    llm.generate("hello", deadline=deadline_module.Deadline(10.0))
+
+    assert 4.9 < seen[0] <= 5.0
+
+
+class SocketTimeoutConnection:
+    """HTTPConnection stand-in whose socket timeout fires before the abort timer."""
+
+    def __init__(self, host, port, timeout) -> None:
+        self.sock = None
+
+    def request(self, *args, **kwargs) -> None:
+        pass
+
+    def getresponse(self):
+        raise TimeoutError("timed out")
+
+    def close(self) -> None:
+        pass
+
+
+def test_socket_timeout_is_reported_as_deadline_exceeded(monkeypatch) -> None:
+    monkeypatch.setattr(brain_module.http.client, "HTTPConnection", SocketTimeoutConnection)
+    llm = brain_module.LocalLLM()
+
+    with pytest.raises(deadline_module.DeadlineExceeded):
+        llm.generate("hello", deadline=deadline_module.Deadline(10.0))
+
+
+def test_socket_timeout_falls_back_instead_of_escaping(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(brain_module.http.client, "HTTPConnection", SocketTimeoutConnection)
+    brain = _build(tmp_path, llm=brain_module.LocalLLM())
+
+    assert brain.handle("hello") == brain.config.fallback_reply
+
+
+def test_unbudgeted_timeout_retries_then_falls_back(tmp_path: Path) -> None:
+    class TimingOutLLM:
+        def __init__(self, succeed_short: bool) -> None:
+            self.succeed_short = succeed_short
+            self.calls: list = []
+
+        def generate(self, prompt: str, max_tokens=None, **options) -> str:
+            self.calls.append(max_tokens)
+            if max_tokens is not None and self.succeed_short:
+                return "short answer"
+            raise TimeoutError("timed out")
+
+    retrying = TimingOutLLM(succeed_short=True)
+    brain = _build(tmp_path, llm=retrying, turn_budget=None, retry_max_tokens=32)
+    assert brain.handle("hello") == "short answer"
+    assert retrying.calls == [None, 32]
+
+    failing = TimingOutLLM(succeed_short=False)
+    brain = _build(tmp_path, llm=failing, turn_budget=None)
+    assert brain.handle("hello") == brain.config.fallback_reply
+
+
+def test_cancel_before_socket_exists_is_not_lost(monkeypatch) -> None:
+    deadline = deadline_module.Deadline(10.0)
+    responses: list[str] = []
+
+    class CancelDuringConnect:
+        def __init__(self, host, port, timeout) -> None:
+            self.sock = None
+
+        def request(self, *args, **kwargs) -> None:
+            deadline.cancel()  # arrives while connecting, before conn.sock is set
+
+        def getresponse(self):
+            responses.append("waited")
+            raise AssertionError("should not wait for a response after cancel")
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(brain_module.http.client, "HTTPConnection", CancelDuringConnect)
+    llm = brain_module.LocalLLM()
+
+    with pytest.raises(deadline_module.RequestCancelled):
+        llm.generate("hello", deadline=deadline)
+    assert responses == []
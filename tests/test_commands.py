@@ -24,3 +24,12 @@ def test_no_match_returns_none() -> None:
     executor = commands_module.CommandExecutor(runner=lambda _: None)
 
     assert executor.execute("tell me a joke") is None
+
+
+def test_matches_does_not_run_command() -> None:
+    calls: list[list[str]] = []
+    executor = commands_module.CommandExecutor(runner=lambda cmd: calls.append(cmd))
+
+    assert executor.matches("Open Browser")
+    assert not executor.matches("open browser please")
+    assert calls == []
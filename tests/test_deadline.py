@@ -0,0 +1,93 @@
+import pytest
+
+import jarvis.deadline as deadline_module
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_deadline_tracks_remaining_time() -> None:
+    clock = FakeClock()
+    deadline = deadline_module.Deadline(5.0, clock=clock)
+
+    clock.now += 2.0
+    assert deadline.remaining() == 3.0
+
+    clock.now += 4.0
+    assert deadline.expired
+    with pytest.raises(deadline_module.DeadlineExceeded):
+        deadline.check()
+
+
+def test_cancel_runs_callbacks_and_propagates_to_children() -> None:
+    calls: list[str] = []
+    deadline = deadline_module.Deadline(5.0)
+    child = deadline.shortened(1.0)
+    deadline.on_cancel(lambda: calls.append("parent"))
+    unregister = deadline.on_cancel(lambda: calls.append("removed"))
+    unregister()
+
+    deadline.cancel()
+
+    assert calls == ["parent"]
+    assert child.cancelled
+    with pytest.raises(deadline_module.RequestCancelled):
+        child.check()
+
+
+def test_on_cancel_after_cancel_runs_immediately() -> None:
+    calls: list[str] = []
+    deadline = deadline_module.Deadline(5.0)
+    deadline.cancel()
+
+    deadline.on_cancel(lambda: calls.append("late"))
+
+    assert calls == ["late"]
+
+
+def test_adaptive_timeout_uses_percentile_of_samples() -> None:
+    timeouts = deadline_module.AdaptiveTimeout(
+        initial=30.0, minimum=1.0, maximum=30.0, percentile=90, multiplier=2.0, min_samples=3
+    )
+    assert timeouts.current() == 30.0
+
+    for elapsed in [1.0, 1.5, 2.0, 2.5, 3.0, 1.0, 1.2, 1.1, 1.3, 4.0]:
+        timeouts.record(elapsed)
+
+    assert timeouts.current() == 6.0
+
+
+def test_adaptive_timeout_is_clamped() -> None:
+    timeouts = deadline_module.AdaptiveTimeout(minimum=2.0, maximum=10.0, min_samples=1)
+
+    timeouts.record(0.1)
+    assert timeouts.current() == 2.0
+
+    for _ in range(10):
+        timeouts.record(60.0)
+    assert timeouts.current() == 10.0
+
+
+def test_adaptive_timeout_grows_back_after_timeouts() -> None:
+    timeouts = deadline_module.AdaptiveTimeout(minimum=2.0, maximum=30.0, min_samples=5)
+    for _ in range(10):
+        timeouts.record(0.5)
+    assert timeouts.current() == 2.0
+
+    timeouts.record_timeout(2.0)
+    assert timeouts.current() == 8.0
+
+    timeouts.record_timeout(8.0)
+    assert timeouts.current() == 30.0
+
+
+def test_adaptive_timeout_respects_floor() -> None:
+    timeouts = deadline_module.AdaptiveTimeout(minimum=2.0, min_samples=1)
+    timeouts.record(0.5)
+
+    assert timeouts.current(floor=7.5) == 7.5
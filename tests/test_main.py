@@ -1,4 +1,9 @@
+import os
+import signal
+import time
+
 import jarvis.main as main_module
+from jarvis.config import AssistantConfig
 
 
 class FakeListener:
@@ -33,7 +38,7 @@ class FakeCommands:
 
 
 class FakeBrain:
-    def handle(self, text: str) -> str:
+    def handle(self, text: str, deadline=None) -> str:
         return f"brain:{text}"
 
 
@@ -43,7 +48,7 @@ def test_run_routes_command_then_brain_and_shutdown(monkeypatch) -> None:
     memory = FakeMemory()
 
     def _build():
-        return FakeBrain(), memory, FakeCommands(), listener, speaker
+        return AssistantConfig(), FakeBrain(), memory, FakeCommands(), listener, speaker
 
     monkeypatch.setattr(main_module, "build_assistant", _build)
 
@@ -54,3 +59,226 @@ def test_run_routes_command_then_brain_and_shutdown(monkeypatch) -> None:
     assert "brain:hello" in speaker.messages
     assert speaker.messages[-1] == "Shutting down."
     assert memory.calls == [("open browser", "Opening browser.")]
+
+
+class StreamingListener:
+    def __init__(self, turns: list[tuple[list[str], str]]) -> None:
+        self.turns = turns
+
+    def listen_stream(self, on_partial) -> str:
+        partials, final = self.turns.pop(0)
+        for partial in partials:
+            on_partial(partial)
+        return final
+
+
+def test_run_speculates_on_stable_partials(monkeypatch, tmp_path) -> None:
+    from jarvis.brain import JarvisBrain
+    from jarvis.commands import CommandExecutor
+    from jarvis.memory import MemoryStore
+    from jarvis.speculation import SpeculativeLLM
+
+    class CountingLLM:
+        def __init__(self) -> None:
+            self.calls: list[str] = []
+
+        def generate(self, prompt: str, **options) -> str:
+            self.calls.append(prompt)
+            return f"llm:{prompt}"
+
+    backend = CountingLLM()
+    speculator = SpeculativeLLM(backend, stable_partials=2)
+    config = AssistantConfig(memory_file=tmp_path / "memory.json")
+    commands = CommandExecutor(runner=lambda _: None)
+    brain = JarvisBrain(
+        config=config,
+        memory=MemoryStore(path=config.memory_file),
+        commands=commands,
+        llm=speculator,
+    )
+    listener = StreamingListener(
+        [
+            (["hello", "hello there", "hello there"], "hello there"),
+            (["what time", "what time is it", "what time is it"], "what time is it"),
+            ([], "shutdown"),
+        ]
+    )
+    speaker = FakeSpeaker()
+    monkeypatch.setattr(
+        main_module, "build_assistant", lambda: (config, brain, brain.memory, commands, listener, speaker)
+    )
+
+    main_module.run()
+
+    assert "llm:hello there" in speaker.messages
+    assert backend.calls == ["hello there"]
+    assert speculator.stats.hits == 1
+    assert speculator.stats.wasted == 0
+
+
+def test_run_drops_echo_and_duplicate_turns(monkeypatch) -> None:
+    class CountingBrain:
+        def __init__(self) -> None:
+            self.calls: list[str] = []
+
+        def handle(self, text: str, deadline=None) -> str:
+            self.calls.append(text)
+            return "The forecast says light rain this evening."
+
+    brain = CountingBrain()
+    listener = FakeListener(
+        ["what is the weather", "what is the weather", "the forecast says light rain this evening", "shutdown"]
+    )
+    speaker = FakeSpeaker()
+    # Treat the fakes as a real mic and TTS so playback can echo and utterances repeat.
+    monkeypatch.setattr(main_module, "SpeechRecognitionVoiceInput", FakeListener)
+    monkeypatch.setattr(main_module, "Pyttsx3VoiceOutput", FakeSpeaker)
+    monkeypatch.setattr(
+        main_module,
+        "build_assistant",
+        lambda: (AssistantConfig(playback_tail=0.0), brain, FakeMemory(), FakeCommands(), listener, speaker),
+    )
+
+    main_module.run()
+
+    assert brain.calls == ["what is the weather"]
+
+
+def test_suppressed_partials_are_not_speculated(monkeypatch, tmp_path) -> None:
+    from jarvis.brain import JarvisBrain
+    from jarvis.commands import CommandExecutor
+    from jarvis.memory import MemoryStore
+    from jarvis.speculation import SpeculativeLLM
+
+    class CountingLLM:
+        def __init__(self) -> None:
+            self.calls: list[str] = []
+
+        def generate(self, prompt: str, **options) -> str:
+            self.calls.append(prompt)
+            return "The forecast says light rain this evening."
+
+    backend = CountingLLM()
+    speculator = SpeculativeLLM(backend, stable_partials=1)
+    config = AssistantConfig(memory_file=tmp_path / "memory.json", playback_tail=0.0)
+    commands = CommandExecutor(runner=lambda _: None)
+    brain = JarvisBrain(config=config, memory=MemoryStore(path=config.memory_file), commands=commands, llm=speculator)
+    echo = "the forecast says light rain this evening"
+    listener = StreamingListener(
+        [
+            (["what is the weather"], "what is the weather"),
+            (["what is the weather"], "what is the weather"),
+            ([echo], echo),
+            ([], "shutdown"),
+        ]
+    )
+    monkeypatch.setattr(main_module, "SpeechRecognitionVoiceInput", StreamingListener)
+    monkeypatch.setattr(main_module, "Pyttsx3VoiceOutput", FakeSpeaker)
+    monkeypatch.setattr(
+        main_module, "build_assistant", lambda: (config, brain, brain.memory, commands, listener, FakeSpeaker())
+    )
+
+    main_module.run()
+
+    assert backend.calls == ["what is the weather"]
+    assert speculator.stats.started == 1
+
+
+def test_console_output_is_not_echo_filtered(monkeypatch) -> None:
+    class CountingBrain:
+        def __init__(self) -> None:
+            self.calls: list[str] = []
+
+        def handle(self, text: str, deadline=None) -> str:
+            self.calls.append(text)
+            return "The forecast says light rain this evening."
+
+    brain = CountingBrain()
+    listener = FakeListener(["what is the weather", "the forecast says light rain this evening", "shutdown"])
+    monkeypatch.setattr(
+        main_module,
+        "build_assistant",
+        lambda: (AssistantConfig(), brain, FakeMemory(), FakeCommands(), listener, FakeSpeaker()),
+    )
+
+    main_module.run()
+
+    assert brain.calls == ["what is the weather", "the forecast says light rain this evening"]
+
+
+def test_typed_repeats_are_not_duplicate_filtered(monkeypatch) -> None:
+    class CountingBrain:
+        def __init__(self) -> None:
+            self.calls: list[str] = []
+
+        def handle(self, text: str, deadline=None) -> str:
+            self.calls.append(text)
+            return "ok"
+
+    brain = CountingBrain()
+    listener = FakeListener(["tell me a joke", "tell me a joke", "shutdown"])
+    monkeypatch.setattr(
+        main_module,
+        "build_assistant",
+        lambda: (AssistantConfig(), brain, FakeMemory(), FakeCommands(), listener, FakeSpeaker()),
+    )
+
+    main_module.run()
+
+    assert brain.calls == ["tell me a joke", "tell me a joke"]
+
+
+def test_run_uses_config_from_build_assistant(monkeypatch) -> None:
+    class CountingBrain:
+        def __init__(self) -> None:
+            self.calls: list[str] = []
+
+        def handle(self, text: str, deadline=None) -> str:
+            self.calls.append(text)
+            return "ok"
+
+    brain = CountingBrain()
+    listener = FakeListener(["what is the weather", "what is the weather", "shutdown"])
+    config = AssistantConfig(suppression_enabled=False)
+    monkeypatch.setattr(main_module, "SpeechRecognitionVoiceInput", FakeListener)
+    monkeypatch.setattr(
+        main_module,
+        "build_assistant",
+        lambda: (config, brain, FakeMemory(), FakeCommands(), listener, FakeSpeaker()),
+    )
+
+    main_module.run()
+
+    assert brain.calls == ["what is the weather", "what is the weather"]
+
+
+def test_ctrl_c_cancels_in_flight_turn(monkeypatch) -> None:
+    class InterruptedBrain:
+        def __init__(self) -> None:
+            self.deadlines: list = []
+
+        def handle(self, text: str, deadline=None) -> str:
+            self.deadlines.append(deadline)
+            os.kill(os.getpid(), signal.SIGINT)
+            # The handler runs between bytecodes; give it a moment.
+            for _ in range(100):
+                if deadline.cancelled:
+                    break
+                time.sleep(0.01)
+            return "cancelled" if deadline.cancelled else "finished"
+
+    brain = InterruptedBrain()
+    speaker = FakeSpeaker()
+    listener = FakeListener(["tell me a long story", "shutdown"])
+    monkeypatch.setattr(
+        main_module,
+        "build_assistant",
+        lambda: (AssistantConfig(), brain, FakeMemory(), FakeCommands(), listener, speaker),
+    )
+
+    previous = signal.getsignal(signal.SIGINT)
+
+    main_module.run()
+
+    assert "cancelled" in speaker.messages
+    assert signal.getsignal(signal.SIGINT) is previous
@@ -0,0 +1,139 @@
+import cProfile
+import pstats
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from types import SimpleNamespace
+
+import jarvis.config as config_module
+import jarvis.memory as memory_module
+import jarvis.profiling as profiling_module
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def _outer() -> int:
+    return _busy(20_000)
+
+
+def test_disabled_profiler_is_noop(tmp_path: Path) -> None:
+    profiler = profiling_module.TurnProfiler(output_dir=tmp_path / "profiles")
+
+    assert isinstance(profiler.turn(), nullcontext)
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_sampled_turn_writes_profile_files(tmp_path: Path) -> None:
+    profiler = profiling_module.TurnProfiler(
+        output_dir=tmp_path, enabled=True, sample_rate=1.0, rng=lambda: 0.0
+    )
+
+    with profiler.turn():
+        _outer()
+
+    suffixes = sorted("".join(path.suffixes) for path in tmp_path.iterdir())
+    assert suffixes == [".alloc.txt", ".collapsed", ".prof"]
+    collapsed = next(tmp_path.glob("*.collapsed")).read_text(encoding="utf-8")
+    assert "_outer (test_profiling.py" in collapsed
+
+
+def test_slow_threshold_only_keeps_slow_turns(tmp_path: Path) -> None:
+    ticks = iter([0.0, 0.01, 1.0, 3.0])
+    profiler = profiling_module.TurnProfiler(
+        output_dir=tmp_path, enabled=True, slow_threshold=1.0, clock=lambda: next(ticks)
+    )
+
+    with profiler.turn("fast"):
+        pass
+    with profiler.turn("slow"):
+        pass
+
+    assert [path.name for path in tmp_path.glob("*.prof")][0].endswith("-slow.prof")
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+
+
+def test_rotation_keeps_newest_profiles(tmp_path: Path) -> None:
+    profiler = profiling_module.TurnProfiler(
+        output_dir=tmp_path, enabled=True, sample_rate=1.0, max_files=2, rng=lambda: 0.0
+    )
+
+    for _ in range(4):
+        with profiler.turn():
+            pass
+
+    stems = sorted({path.name.split(".", 1)[0] for path in tmp_path.iterdir()})
+    assert len(stems) == 2
+    assert stems[-1].endswith("0004-turn")
+
+
+def test_collapsed_stacks_nest_callers() -> None:
+    profile = cProfile.Profile()
+    profile.runcall(_outer)
+
+    lines = profiling_module.collapsed_stacks(pstats.Stats(profile))
+
+    assert any("_outer" in line.split(" ")[0] and "_busy" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def _dense_call_graph(layers: int, width: int, self_time: float = 0.001) -> SimpleNamespace:
+    """Stats-like object where every function calls every function in the next layer."""
+    root = ("app.py", 1, "main")
+    raw = {}
+    cumulative = self_time
+    for layer in reversed(range(layers)):
+        funcs = [("app.py", 100 * (layer + 1) + i, f"f{layer}_{i}") for i in range(width)]
+        if layer == 0:
+            callers = [root]
+        else:
+            callers = [("app.py", 100 * layer + j, f"f{layer - 1}_{j}") for j in range(width)]
+        share = cumulative / len(callers)
+        for func in funcs:
+            raw[func] = (1, 1, self_time, cumulative, {c: (1, 1, 0.0, share) for c in callers})
+        cumulative = self_time + width * cumulative if layer == 0 else self_time + cumulative
+    raw[root] = (1, 1, self_time, cumulative, {})
+    return SimpleNamespace(stats=raw)
+
+
+def test_collapsed_stacks_stay_bounded_on_dense_graphs() -> None:
+    # 10**20 distinct root-to-leaf paths; a full walk would never finish.
+    stats = _dense_call_graph(layers=20, width=10)
+    total = stats.stats[("app.py", 1, "main")][3]
+
+    started = time.perf_counter()
+    lines = profiling_module.collapsed_stacks(stats, max_nodes=5_000)
+
+    assert time.perf_counter() - started < 2.0
+    assert len(lines) <= 5_000
+    emitted = sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+    assert abs(emitted - total * 1_000_000) / (total * 1_000_000) < 0.01
+
+
+def test_collapsed_stacks_for_real_profile(tmp_path: Path) -> None:
+    def workload() -> None:
+        store = memory_module.MemoryStore(path=tmp_path / "memory.json")
+        for i in range(20):
+            store.add_interaction(user_text=f"question {i}", assistant_text=f"answer {i}")
+        profiling_module.collapsed_stacks(_dense_call_graph(layers=5, width=4))
+
+    profile = cProfile.Profile()
+    profile.runcall(workload)
+    stats = pstats.Stats(profile)
+
+    lines = profiling_module.collapsed_stacks(stats)
+
+    assert len(stats.stats) > 50  # type: ignore[attr-defined]
+    assert any("workload" in line and "save_memory" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_env_var_enables_profiling(tmp_path: Path) -> None:
+    config = config_module.AssistantConfig(profile_dir=tmp_path)
+
+    assert not profiling_module.TurnProfiler.from_config(config, environ={}).enabled
+    profiler = profiling_module.TurnProfiler.from_config(config, environ={"JARVIS_PROFILE": "1"})
+
+    assert profiler.enabled
+    assert profiler.sample_rate == 1.0
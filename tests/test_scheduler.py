@@ -0,0 +1,165 @@
+import threading
+import time
+
+import pytest
+
+import jarvis.scheduler as scheduler_module
+from jarvis.scheduler import Priority
+
+
+class RecordingLLM:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[str] = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt: str) -> str:
+        with self.lock:
+            self.calls.append(prompt)
+        time.sleep(self.delay)
+        return f"done:{prompt}"
+
+
+class GateLLM:
+    """Blocks the first call until released so later jobs pile up in the queue."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls: list[str] = []
+
+    def generate(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        if prompt == "blocker":
+            self.started.set()
+            self.release.wait(timeout=5)
+        return prompt
+
+
+def _wait_for_depth(scheduler: scheduler_module.LLMScheduler, depth: int) -> None:
+    deadline = time.monotonic() + 5
+    while scheduler.queue_depth() < depth and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def _submit_async(scheduler, prompt, priority, session="default") -> threading.Thread:
+    thread = threading.Thread(
+        target=scheduler.submit, args=(prompt,), kwargs={"priority": priority, "session": session}
+    )
+    thread.start()
+    return thread
+
+
+def test_generate_passes_through_to_backend() -> None:
+    scheduler = scheduler_module.LLMScheduler(RecordingLLM())
+
+    assert scheduler.generate("hello") == "done:hello"
+    assert scheduler.queue_depth() == 0
+    assert scheduler.active == 0
+
+
+def test_interactive_jumps_queued_background_jobs() -> None:
+    llm = GateLLM()
+    scheduler = scheduler_module.LLMScheduler(llm)
+    threads = [_submit_async(scheduler, "blocker", Priority.BACKGROUND)]
+    llm.started.wait(timeout=5)
+
+    threads.append(_submit_async(scheduler, "bg-1", Priority.BACKGROUND))
+    threads.append(_submit_async(scheduler, "bg-2", Priority.BACKGROUND))
+    _wait_for_depth(scheduler, 2)
+    threads.append(_submit_async(scheduler, "turn", Priority.INTERACTIVE))
+    _wait_for_depth(scheduler, 3)
+    assert scheduler.queue_depth(Priority.BACKGROUND) == 2
+    assert scheduler.queue_depth(Priority.INTERACTIVE) == 1
+
+    llm.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert llm.calls[:2] == ["blocker", "turn"]
+
+
+def test_sessions_are_served_round_robin() -> None:
+    llm = GateLLM()
+    scheduler = scheduler_module.LLMScheduler(llm)
+    threads = [_submit_async(scheduler, "blocker", Priority.BACKGROUND)]
+    llm.started.wait(timeout=5)
+
+    for index, prompt in enumerate(["a1", "a2", "a3", "b1"]):
+        session = "a" if prompt.startswith("a") else "b"
+        threads.append(_submit_async(scheduler, prompt, Priority.BACKGROUND, session))
+        _wait_for_depth(scheduler, index + 1)
+
+    llm.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert llm.calls == ["blocker", "a1", "b1", "a2", "a3"]
+
+
+def _p99(samples: list[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(0.99 * len(ordered)) - 1))]
+
+
+def _interactive_turn_latencies(background_sessions: int, delay: float, turns: int = 30) -> tuple[list[float], dict]:
+    """End-to-end `generate` latencies for live turns with N busy background sessions."""
+    scheduler = scheduler_module.LLMScheduler(RecordingLLM(delay=delay), max_concurrent=1)
+    stop = threading.Event()
+
+    def background_worker(session: str) -> None:
+        while not stop.is_set():
+            scheduler.submit("batch", priority=Priority.BACKGROUND, session=session)
+
+    workers = [
+        threading.Thread(target=background_worker, args=(f"bg-{i}",)) for i in range(background_sessions)
+    ]
+    for worker in workers:
+        worker.start()
+    if workers:
+        _wait_for_depth(scheduler, background_sessions - 1)
+
+    latencies: list[float] = []
+    try:
+        for _ in range(turns):
+            started = time.monotonic()
+            scheduler.generate("turn")
+            latencies.append(time.monotonic() - started)
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=5)
+    return latencies, scheduler.metrics()
+
+
+def test_interactive_p99_stays_flat_under_background_load() -> None:
+    delay = 0.02
+    baseline, _ = _interactive_turn_latencies(background_sessions=0, delay=delay)
+    loaded, metrics = _interactive_turn_latencies(background_sessions=6, delay=delay)
+
+    # FIFO would put each turn behind up to six queued batch calls (+120 ms).
+    # Priority bounds the extra latency to the one call already on the backend.
+    assert _p99(loaded) <= _p99(baseline) + 1.5 * delay + 0.01
+    assert metrics["interactive_queue_depth"] == 0
+    assert metrics["background_wait_p99"] >= metrics["interactive_wait_p99"]
+
+
+def test_queued_job_gives_up_when_deadline_cancelled() -> None:
+    from jarvis.deadline import Deadline, RequestCancelled
+
+    llm = GateLLM()
+    scheduler = scheduler_module.LLMScheduler(llm)
+    blocker = _submit_async(scheduler, "blocker", Priority.BACKGROUND)
+    llm.started.wait(timeout=5)
+    deadline = Deadline(10.0)
+    threading.Timer(0.05, deadline.cancel).start()
+
+    try:
+        with pytest.raises(RequestCancelled):
+            scheduler.generate("turn", deadline=deadline)
+    finally:
+        llm.release.set()
+        blocker.join(timeout=5)
+
+    assert scheduler.queue_depth() == 0
+    assert llm.calls == ["blocker"]
@@ -0,0 +1,238 @@
+import threading
+import time
+
+import jarvis.speculation as speculation_module
+from jarvis.deadline import Deadline, RequestCancelled
+from jarvis.scheduler import LLMScheduler, Priority
+
+
+class CountingLLM:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt: str, **options) -> str:
+        with self.lock:
+            self.calls.append(prompt)
+        return f"reply:{prompt}"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+def test_stable_partial_is_reused_for_matching_final() -> None:
+    llm = CountingLLM()
+    speculator = speculation_module.SpeculativeLLM(llm, stable_partials=2, clock=FakeClock())
+    speculator.begin_turn()
+
+    speculator.on_partial("tell me")
+    speculator.on_partial("tell me a joke")
+    speculator.on_partial("tell me a joke")
+    response = speculator.generate("Tell me a joke.")
+
+    assert response == "reply:tell me a joke"
+    assert llm.calls == ["tell me a joke"]
+    assert speculator.stats.hits == 1
+    assert speculator.stats.wasted == 0
+    assert speculator.stats.latency_saved > 0
+
+
+def test_mismatched_final_discards_speculation() -> None:
+    llm = CountingLLM()
+    speculator = speculation_module.SpeculativeLLM(llm, stable_partials=1)
+    speculator.begin_turn()
+
+    speculator.on_partial("tell me a joke")
+    response = speculator.generate("tell me a joke about cats")
+
+    assert response == "reply:tell me a joke about cats"
+    assert speculator.stats.started == 1
+    assert speculator.stats.wasted == 1
+    assert speculator.stats.hits == 0
+
+
+def test_budget_caps_speculations_per_turn() -> None:
+    llm = CountingLLM()
+    speculator = speculation_module.SpeculativeLLM(llm, stable_partials=1, max_speculations=1)
+    speculator.begin_turn()
+
+    speculator.on_partial("play")
+    speculator.on_partial("play some music")
+    speculator.generate("play some music")
+
+    assert speculator.stats.started == 1
+    assert speculator.stats.wasted == 1
+
+
+def test_filtered_routes_do_not_speculate() -> None:
+    llm = CountingLLM()
+    speculator = speculation_module.SpeculativeLLM(llm, stable_partials=1)
+    speculator.begin_turn(should_speculate=lambda text: not text.startswith("run "))
+
+    speculator.on_partial("run what time is it")
+    speculator.end_turn()
+
+    assert speculator.stats.started == 0
+    assert llm.calls == []
+
+
+class BlockingBackend:
+    """Holds speculative prompts until their deadline is cancelled."""
+
+    def __init__(self) -> None:
+        self.speculation_started = threading.Event()
+        self.cancelled = threading.Event()
+        self.calls: list[str] = []
+
+    def generate(self, prompt: str, deadline=None, **options) -> str:
+        self.calls.append(prompt)
+        if prompt == "hello":
+            self.speculation_started.set()
+            deadline.on_cancel(self.cancelled.set)
+            self.cancelled.wait(timeout=5)
+            raise RequestCancelled("aborted")
+        return f"reply:{prompt}"
+
+
+def test_missed_speculation_is_cancelled_and_does_not_block_turn() -> None:
+    backend = BlockingBackend()
+    scheduler = LLMScheduler(backend, max_concurrent=1)
+    speculator = speculation_module.SpeculativeLLM(scheduler, stable_partials=1)
+    speculator.begin_turn()
+    speculator.on_partial("hello")
+    assert backend.speculation_started.wait(timeout=5)
+
+    started = time.monotonic()
+    response = speculator.generate("hello there friend", deadline=Deadline(10.0))
+
+    assert response == "reply:hello there friend"
+    assert time.monotonic() - started < 1.0
+    assert backend.cancelled.is_set()
+    assert speculator.stats.wasted == 1
+
+
+def test_speculation_is_cancelled_at_end_of_turn() -> None:
+    backend = BlockingBackend()
+    speculator = speculation_module.SpeculativeLLM(backend, stable_partials=1)
+    speculator.begin_turn()
+    speculator.on_partial("hello")
+    assert backend.speculation_started.wait(timeout=5)
+
+    speculator.end_turn()
+
+    assert backend.cancelled.is_set()
+
+
+def test_speculation_queues_behind_live_turns() -> None:
+    calls: list[str] = []
+    gate = threading.Event()
+
+    class GateBackend:
+        def generate(self, prompt: str, **options) -> str:
+            calls.append(prompt)
+            if prompt == "blocker":
+                gate.wait(timeout=5)
+            return prompt
+
+    scheduler = LLMScheduler(GateBackend(), max_concurrent=1)
+    blocker = threading.Thread(target=scheduler.generate, args=("blocker",))
+    blocker.start()
+    while not calls:
+        time.sleep(0.001)
+    speculator = speculation_module.SpeculativeLLM(scheduler, stable_partials=1)
+    speculator.begin_turn()
+    speculator.on_partial("speculative prompt")
+    while scheduler.queue_depth(Priority.BACKGROUND) < 1:
+        time.sleep(0.001)
+    live = threading.Thread(target=scheduler.generate, args=("live turn",))
+    live.start()
+    while scheduler.queue_depth(Priority.INTERACTIVE) < 1:
+        time.sleep(0.001)
+
+    gate.set()
+    blocker.join(timeout=5)
+    live.join(timeout=5)
+    speculator.generate("speculative prompt")
+
+    assert calls == ["blocker", "live turn", "speculative prompt"]
+
+
+def test_matched_speculation_is_promoted_to_interactive() -> None:
+    calls: list[str] = []
+    gate = threading.Event()
+
+    class GateBackend:
+        def generate(self, prompt: str, **options) -> str:
+            calls.append(prompt)
+            if prompt == "blocker":
+                gate.wait(timeout=5)
+            return prompt
+
+    scheduler = LLMScheduler(GateBackend(), max_concurrent=1)
+    threads = [threading.Thread(target=scheduler.submit, args=("blocker",))]
+    threads[0].start()
+    while not calls:
+        time.sleep(0.001)
+    for i in range(3):
+        threads.append(
+            threading.Thread(target=scheduler.submit, args=(f"batch-{i}",), kwargs={"session": f"bg-{i}"})
+        )
+        threads[-1].start()
+    while scheduler.queue_depth(Priority.BACKGROUND) < 3:
+        time.sleep(0.001)
+    speculator = speculation_module.SpeculativeLLM(scheduler, stable_partials=1)
+    speculator.begin_turn()
+    speculator.on_partial("what is the weather")
+    while scheduler.queue_depth(Priority.BACKGROUND) < 4:
+        time.sleep(0.001)
+
+    collector = threading.Thread(target=speculator.generate, args=("what is the weather",))
+    collector.start()
+    while scheduler.queue_depth(Priority.INTERACTIVE) < 1:
+        time.sleep(0.001)
+    gate.set()
+    collector.join(timeout=5)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls[:2] == ["blocker", "what is the weather"]
+    assert speculator.stats.hits == 1
+
+
+def test_reprioritize_before_submit_applies_to_next_job() -> None:
+    calls: list[str] = []
+    gate = threading.Event()
+
+    class GateBackend:
+        def generate(self, prompt: str, **options) -> str:
+            calls.append(prompt)
+            if prompt == "blocker":
+                gate.wait(timeout=5)
+            return prompt
+
+    scheduler = LLMScheduler(GateBackend(), max_concurrent=1)
+    threads = [threading.Thread(target=scheduler.submit, args=("blocker",))]
+    threads[0].start()
+    while not calls:
+        time.sleep(0.001)
+    threads.append(threading.Thread(target=scheduler.submit, args=("batch",), kwargs={"session": "bg"}))
+    threads[-1].start()
+    while scheduler.queue_depth(Priority.BACKGROUND) < 1:
+        time.sleep(0.001)
+
+    scheduler.reprioritize("late", Priority.INTERACTIVE)
+    threads.append(threading.Thread(target=scheduler.submit, args=("late",), kwargs={"session": "late"}))
+    threads[-1].start()
+    while scheduler.queue_depth(Priority.INTERACTIVE) < 1:
+        time.sleep(0.001)
+    gate.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == ["blocker", "late", "batch"]
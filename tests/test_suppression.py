@@ -0,0 +1,155 @@
+import jarvis.suppression as suppression_module
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _suppressor(clock: FakeClock, **kwargs) -> suppression_module.UtteranceSuppressor:
+    return suppression_module.UtteranceSuppressor(clock=clock, sleep=lambda s: None, **kwargs)
+
+
+def test_shingles_use_word_pairs_and_whole_short_text() -> None:
+    assert suppression_module.shingles("Open the Browser!") == {"open the", "the browser"}
+    assert suppression_module.shingles("Hello.") == {"hello"}
+    assert suppression_module.shingles("  ") == set()
+
+
+def test_assistant_echo_is_suppressed_within_window() -> None:
+    clock = FakeClock()
+    suppressor = _suppressor(clock, echo_window=10.0)
+    suppressor.record_assistant("The weather today is sunny and warm.")
+
+    assert suppressor.check("weather today is sunny and warm") == "echo"
+
+    clock.now = 11.0
+    assert suppressor.check("weather today is sunny and warm") is None
+    assert suppressor.stats.echoes == 1
+
+
+def test_reply_reusing_assistant_words_is_not_echo() -> None:
+    suppressor = _suppressor(FakeClock())
+    suppressor.record_assistant("Do you want me to open the browser?")
+
+    assert suppressor.check("open the browser") is None
+
+
+def test_short_reply_matching_assistant_is_not_echo() -> None:
+    clock = FakeClock()
+    suppressor = _suppressor(clock)
+    suppressor.record_assistant("Yes")
+
+    assert suppressor.check("yes") is None
+    assert suppressor.stats.echoes == 0
+
+
+def test_echo_only_matches_shortly_after_playback() -> None:
+    clock = FakeClock()
+    suppressor = _suppressor(clock, echo_window=2.0)
+    suppressor.record_assistant("Your meeting starts at three this afternoon.")
+
+    clock.now = 3.0
+    assert suppressor.check("your meeting starts at three this afternoon") is None
+
+
+def test_repeated_user_utterance_is_duplicate() -> None:
+    clock = FakeClock()
+    suppressor = _suppressor(clock, duplicate_window=3.0)
+
+    assert suppressor.check("tell me a joke") is None
+    clock.now = 1.0
+    assert suppressor.check("Tell me a joke.") == "duplicate"
+    clock.now = 5.0
+    assert suppressor.check("tell me a joke") is None
+    assert suppressor.stats.duplicates == 1
+
+
+def test_capture_during_playback_is_muted() -> None:
+    clock = FakeClock()
+    suppressor = _suppressor(clock, playback_tail=0.5)
+
+    suppressor.playback_started()
+    assert suppressor.check("anything at all") == "muted"
+    suppressor.playback_finished()
+    assert suppressor.muted
+    clock.now = 1.0
+    assert not suppressor.muted
+    assert suppressor.check("anything at all") is None
+
+
+def test_model_time_avoided_uses_recent_turn_cost() -> None:
+    clock = FakeClock()
+    suppressor = _suppressor(clock)
+    suppressor.record_turn_cost(2.0)
+
+    suppressor.check("what is the capital of france")
+    suppressor.check("what is the capital of france")
+
+    assert suppressor.stats.suppressed == 1
+    assert suppressor.stats.model_time_avoided == 2.0
+
+
+def test_disabled_suppressor_lets_everything_through() -> None:
+    suppressor = _suppressor(FakeClock(), enabled=False)
+    suppressor.record_assistant("hello there friend")
+
+    assert suppressor.check("hello there friend") is None
+    assert suppressor.check("hello there friend") is None
+
+
+def test_echo_aware_output_mutes_while_speaking() -> None:
+    clock = FakeClock()
+    suppressor = _suppressor(clock, playback_tail=0.0)
+    seen: list[bool] = []
+
+    class Speaker:
+        def speak(self, text: str) -> None:
+            seen.append(suppressor.muted)
+
+    output = suppression_module.EchoAwareVoiceOutput(Speaker(), suppressor)
+    output.speak("Opening the browser now.")
+
+    assert seen == [True]
+    assert not suppressor.muted
+    assert suppressor.check("opening the browser now") == "echo"
+
+
+def test_inaudible_output_is_not_indexed_for_echoes() -> None:
+    suppressor = _suppressor(FakeClock())
+
+    class Speaker:
+        def speak(self, text: str) -> None:
+            pass
+
+    output = suppression_module.EchoAwareVoiceOutput(Speaker(), suppressor, audible=False)
+    output.speak("Opening the browser now.")
+
+    assert not suppressor.muted
+    assert suppressor.check("opening the browser now") is None
+
+
+def test_peek_does_not_index_or_count() -> None:
+    clock = FakeClock()
+    suppressor = _suppressor(clock)
+    suppressor.record_assistant("The forecast says light rain this evening.")
+
+    assert suppressor.peek("tell me a joke") is None
+    assert suppressor.peek("tell me a joke") is None
+    assert suppressor.peek("the forecast says light rain this evening") == "echo"
+    assert suppressor.stats.suppressed == 0
+
+    assert suppressor.check("tell me a joke") is None
+    assert suppressor.peek("tell me a joke") == "duplicate"
+
+
+def test_repeat_passes_without_dedupe() -> None:
+    suppressor = _suppressor(FakeClock())
+
+    assert suppressor.check("tell me a joke", dedupe=False) is None
+    assert suppressor.check("tell me a joke", dedupe=False) is None
+    assert suppressor.peek("tell me a joke", dedupe=False) is None
+    assert suppressor.stats.duplicates == 0
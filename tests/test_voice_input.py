@@ -78,3 +78,7 @@ def test_listen_returns_empty_on_timeout_error() -> None:
     )
 
     assert voice.listen() == ""
+
+
+def test_normalize_transcript_ignores_case_and_punctuation() -> None:
+    assert voice_input_module.normalize_transcript("  What's the  weather?") == "what's the weather"